@@ -14,9 +14,27 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import sys
+import tempfile
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Matches a well-formed {{#var}}content{{/var}} conditional section.
+_COND_RE = re.compile(r"\{\{#(\w+)\}\}(.*?)\{\{/\1\}\}", re.DOTALL)
+# Matches any conditional section left unresolved, including mismatched pairs.
+_STRAY_COND_RE = re.compile(r"\{\{#\w+\}\}.*?\{\{/\w+\}\}", re.DOTALL)
+# Matches a {{var}} placeholder.
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
 
 def _find_agent_by_pid(registry_dir: Path) -> dict[str, object] | None:
     """Search registry for an agent matching the parent PID."""
@@ -24,18 +42,86 @@ def _find_agent_by_pid(registry_dir: Path) -> dict[str, object] | None:
     if not registry_dir.exists():
         return None
 
-    for path in registry_dir.glob("*.json"):
-        try:
-            with open(path) as f:
-                data: dict[str, object] = json.load(f)
-            raw_pid = data.get("pid")
-            if raw_pid is not None and int(str(raw_pid)) == ppid:
-                return data
-        except (json.JSONDecodeError, OSError, ValueError, TypeError):
-            continue
+    # Fast path: PID index entry naming the agent's registry file
+    index_path = registry_dir / "by-pid" / f"{ppid}.json"
+    indexed = _resolve_pid_index(registry_dir, index_path, ppid)
+    if indexed is not None:
+        return indexed
+    # Missing or stale pointer; drop it so the index does not accumulate
+    with suppress(OSError):
+        index_path.unlink()
+
+    # Cheap byte-level prefilter so only the matching entry gets JSON-parsed
+    pid_re = re.compile(rb'"pid"\s*:\s*"?' + str(ppid).encode() + rb"\b")
+    try:
+        with os.scandir(registry_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        raw = f.read()
+                    if pid_re.search(raw) is None:
+                        continue
+                    data: dict[str, object] = _loads(raw)
+                    raw_pid = data.get("pid")
+                    if raw_pid is not None and int(str(raw_pid)) == ppid:
+                        _write_pid_index(registry_dir, ppid, entry.name)
+                        return data
+                except (json.JSONDecodeError, OSError, ValueError, TypeError):
+                    continue
+    except OSError:
+        pass
     return None
 
 
+def _resolve_pid_index(
+    registry_dir: Path, index_path: Path, pid: int
+) -> dict[str, object] | None:
+    """Return the registry entry an index pointer names, if it still has pid."""
+    try:
+        pointer = _loads(index_path.read_bytes())
+        entry_name = Path(str(pointer["registry_file"])).name
+        data: dict[str, object] = _loads((registry_dir / entry_name).read_bytes())
+        raw_pid = data.get("pid")
+        if raw_pid is not None and int(str(raw_pid)) == pid:
+            return data
+    except (json.JSONDecodeError, OSError, ValueError, TypeError, KeyError):
+        pass
+    return None
+
+
+def _prune_pid_index(registry_dir: Path, index_dir: Path) -> None:
+    """Remove index pointers whose registry entry is gone or has another PID."""
+    with os.scandir(index_dir) as it:
+        for entry in it:
+            stem, ext = os.path.splitext(entry.name)
+            if ext != ".json" or not stem.isdigit():
+                continue
+            if _resolve_pid_index(registry_dir, Path(entry.path), int(stem)) is None:
+                with suppress(OSError):
+                    os.unlink(entry.path)
+
+
+def _write_pid_index(registry_dir: Path, ppid: int, entry_name: str) -> None:
+    """Record which registry file belongs to ppid (best effort, atomic)."""
+    index_dir = registry_dir / "by-pid"
+    tmp_path: str | None = None
+    try:
+        index_dir.mkdir(exist_ok=True)
+        # Synapse cleans the registry but not this index, so prune it here
+        _prune_pid_index(registry_dir, index_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps({"registry_file": entry_name}).encode())
+        os.replace(tmp_path, index_dir / f"{ppid}.json")
+    except OSError:
+        if tmp_path is not None:
+            with suppress(OSError):
+                os.unlink(tmp_path)
+
+
+@lru_cache(maxsize=1)
 def _get_registry_dir() -> Path:
     """Get registry directory path, respecting SYNAPSE_REGISTRY_DIR env var."""
     env_dir = os.environ.get("SYNAPSE_REGISTRY_DIR")
@@ -59,8 +145,7 @@ def _get_agent_info_from_registry(
         return None
 
     try:
-        with open(path) as f:
-            result: dict[str, object] = json.load(f)
+        result: dict[str, object] = _loads(path.read_bytes())
         return result
     except (json.JSONDecodeError, OSError):
         return None
@@ -101,19 +186,20 @@ def _get_instruction(
 
 def _process_conditionals(text: str, variables: dict[str, str]) -> str:
     """Process {{#var}}content{{/var}} conditional sections."""
-    import re
-
-    for var_name, value in variables.items():
-        pattern = rf"\{{\{{#{var_name}\}}\}}(.*?)\{{\{{/{var_name}\}}\}}"
-        if value:
-            text = re.sub(pattern, r"\1", text, flags=re.DOTALL)
-        else:
-            text = re.sub(pattern, "", text, flags=re.DOTALL)
+    if "{{#" not in text:
+        return text
+    # Kept sections may themselves contain conditionals, so resolve them too
+    text = _COND_RE.sub(
+        lambda m: (
+            _process_conditionals(m.group(2), variables)
+            if variables.get(m.group(1))
+            else ""
+        ),
+        text,
+    )
 
     # Remove any remaining unprocessed conditional sections
-    remaining = r"\{\{#\w+\}\}.*?\{\{/\w+\}\}"
-    text = re.sub(remaining, "", text, flags=re.DOTALL)
-    return text
+    return _STRAY_COND_RE.sub("", text)
 
 
 def _fallback_instruction(
@@ -134,11 +220,13 @@ def _fallback_instruction(
             try:
                 content = default_md.read_text(encoding="utf-8")
                 content = _process_conditionals(content, {"agent_role": display_role})
-                content = content.replace("{{agent_id}}", agent_id)
-                content = content.replace("{{agent_name}}", display_name)
-                content = content.replace("{{agent_role}}", display_role)
-                content = content.replace("{{port}}", str(port))
-                return content
+                subs = {
+                    "agent_id": agent_id,
+                    "agent_name": display_name,
+                    "agent_role": display_role,
+                    "port": str(port),
+                }
+                return _VAR_RE.sub(lambda m: subs.get(m.group(1), m.group(0)), content)
             except OSError:
                 continue
 
@@ -166,11 +254,13 @@ def main() -> int:
     registry_dir = _get_registry_dir()
     name: str | None = None
     role: str | None = None
+    agent_info_cache: dict[str, object] | None = None
 
     # If env vars are missing, try PID-based fallback
     if not all([agent_id, agent_type, port_str]):
         agent_info = _find_agent_by_pid(registry_dir)
         if agent_info:
+            agent_info_cache = agent_info
             raw_id = agent_info.get("agent_id")
             if raw_id is not None:
                 agent_id = str(raw_id)
@@ -201,7 +291,11 @@ def main() -> int:
 
     # Look up name/role from registry if not already set
     if not name:
-        agent_info = _get_agent_info_from_registry(agent_id, registry_dir)
+        # Reuse the PID lookup result when it already describes this agent
+        if agent_info_cache and str(agent_info_cache.get("agent_id")) == agent_id:
+            agent_info = agent_info_cache
+        else:
+            agent_info = _get_agent_info_from_registry(agent_id, registry_dir)
         if agent_info:
             name, role = _extract_name_role(agent_info)
 
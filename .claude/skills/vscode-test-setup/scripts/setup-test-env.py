@@ -12,12 +12,57 @@ Usage:
 """
 
 import argparse
+import copy
 import json
 import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# A generated file: destination path and its UTF-8 encoded content
+GeneratedFile = Tuple[Path, bytes]
+
+MOCHA_DEPENDENCIES: Tuple[str, ...] = (
+    '@vscode/test-cli',
+    '@vscode/test-electron',
+    'mocha',
+    'chai',
+    'sinon',
+    'sinon-chai',
+    'chai-as-promised',
+    '@types/mocha',
+    '@types/chai',
+    '@types/sinon'
+)
+
+JEST_DEPENDENCIES: Tuple[str, ...] = (
+    'jest',
+    'ts-jest',
+    '@types/jest',
+    '@vscode/test-electron'
+)
+
+COVERAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'c8': ('c8',),
+    'nyc': ('nyc', '@istanbuljs/nyc-config-typescript')
+}
+
+# Static file templates shipped with this skill
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+# Integer literals wider than 64 bits, which orjson cannot represent exactly
+_WIDE_INT_RE = re.compile(rb'\d{20,}')
+
+# Per-file progress messages, written to stdout in one go by _flush_log()
+_log: List[str] = []
 
 
 def parse_args() -> argparse.Namespace:
@@ -60,42 +105,78 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def get_mocha_dependencies() -> List[str]:
+def get_mocha_dependencies() -> Tuple[str, ...]:
     """Return Mocha stack dependencies."""
-    return [
-        '@vscode/test-cli',
-        '@vscode/test-electron',
-        'mocha',
-        'chai',
-        'sinon',
-        'sinon-chai',
-        'chai-as-promised',
-        '@types/mocha',
-        '@types/chai',
-        '@types/sinon'
-    ]
+    return MOCHA_DEPENDENCIES
 
 
-def get_jest_dependencies() -> List[str]:
+def get_jest_dependencies() -> Tuple[str, ...]:
     """Return Jest stack dependencies."""
-    return [
-        'jest',
-        'ts-jest',
-        '@types/jest',
-        '@vscode/test-electron'
-    ]
+    return JEST_DEPENDENCIES
 
 
-def get_coverage_dependencies(tool: str) -> List[str]:
+def get_coverage_dependencies(tool: str) -> Tuple[str, ...]:
     """Return coverage tool dependencies."""
-    if tool == 'c8':
-        return ['c8']
-    elif tool == 'nyc':
-        return ['nyc', '@istanbuljs/nyc-config-typescript']
-    return []
+    return COVERAGE_DEPENDENCIES.get(tool, ())
+
+
+def _log_say(msg: str) -> None:
+    """Buffer a progress message."""
+    _log.append(msg)
+
+
+def _flush_log() -> None:
+    """Write all buffered progress messages to stdout."""
+    if _log:
+        sys.stdout.write('\n'.join(_log) + '\n')
+        sys.stdout.flush()
+        _log.clear()
+
+
+def read_template(name: str) -> bytes:
+    """Read a file template from the skill's templates directory."""
+    return (TEMPLATES_DIR / name).read_bytes()
+
+
+def _has_float(obj: Any) -> bool:
+    """Return True if obj contains a float anywhere."""
+    if isinstance(obj, float):
+        return True
+    if isinstance(obj, dict):
+        return any(_has_float(value) for value in obj.values())
+    if isinstance(obj, list):
+        return any(_has_float(value) for value in obj)
+    return False
+
+
+def load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it yields the same result as json."""
+    data = path.read_bytes()
+    # orjson turns integers beyond 64 bits into lossy floats
+    if orjson and not _WIDE_INT_RE.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize to 2-space indented JSON with a trailing newline.
 
+    orjson is only used when its output matches json's byte for byte; it
+    formats floats differently (1e20 vs 1e+20) and rejects wide integers.
+    """
+    if orjson and not _has_float(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    # Lone surrogates can only occur in strings; re-escape them as \uXXXX
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + '\n').encode('utf-8', 'backslashreplace')
 
-def create_directory_structure(project_path: Path, dry_run: bool) -> None:
+
+def create_directory_structure(project_path: Path, ci: str, dry_run: bool) -> None:
     """Create test directory structure."""
     directories = [
         'src/test/unit',
@@ -105,46 +186,29 @@ def create_directory_structure(project_path: Path, dry_run: bool) -> None:
         'src/test/helpers',
         'test-fixtures/.vscode'
     ]
+    if ci == 'github':
+        directories.append('.github/workflows')
 
     for dir_path in directories:
         full_path = project_path / dir_path
         if dry_run:
-            print(f'Would create directory: {full_path}')
+            _log_say(f'Would create directory: {full_path}')
         else:
             full_path.mkdir(parents=True, exist_ok=True)
-            print(f'Created directory: {full_path}')
-
-
-def create_vscode_test_config(project_path: Path, dry_run: bool) -> None:
-    """Create .vscode-test.js configuration."""
-    config_content = """const { defineConfig } = require('@vscode/test-cli');
-
-module.exports = defineConfig({
-  files: 'out/test/**/*.test.js',
-  version: 'stable',
-  workspaceFolder: './test-fixtures',
-  launchArgs: [
-    '--disable-extensions',
-    '--disable-workspace-trust'
-  ],
-  mocha: {
-    timeout: 20000,
-    ui: 'bdd',
-    color: true,
-    retries: process.env.CI ? 2 : 0
-  }
-});
-"""
+            _log_say(f'Created directory: {full_path}')
+
+
+def create_vscode_test_config(project_path: Path, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return .vscode-test.js configuration to be written."""
     config_path = project_path / '.vscode-test.js'
     if dry_run:
-        print(f'Would create: {config_path}')
-    else:
-        config_path.write_text(config_content)
-        print(f'Created: {config_path}')
+        _log_say(f'Would create: {config_path}')
+        return None
+    return config_path, read_template('vscode-test.js.tmpl')
 
 
-def create_mocharc(project_path: Path, dry_run: bool) -> None:
-    """Create .mocharc.json configuration."""
+def create_mocharc(project_path: Path, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return .mocharc.json configuration to be written."""
     config = {
         "require": ["ts-node/register"],
         "extension": ["ts"],
@@ -157,51 +221,22 @@ def create_mocharc(project_path: Path, dry_run: bool) -> None:
     }
     config_path = project_path / '.mocharc.json'
     if dry_run:
-        print(f'Would create: {config_path}')
-    else:
-        config_path.write_text(json.dumps(config, indent=2))
-        print(f'Created: {config_path}')
-
-
-def create_jest_config(project_path: Path, dry_run: bool) -> None:
-    """Create jest.config.js configuration."""
-    config_content = """/** @type {import('jest').Config} */
-module.exports = {
-  preset: 'ts-jest',
-  testEnvironment: 'node',
-  roots: ['<rootDir>/src/test/unit'],
-  testMatch: ['**/*.test.ts'],
-  moduleFileExtensions: ['ts', 'js', 'json'],
-  collectCoverageFrom: [
-    'src/**/*.ts',
-    '!src/test/**',
-    '!**/*.d.ts'
-  ],
-  coverageDirectory: 'coverage',
-  coverageReporters: ['text', 'lcov', 'html'],
-  coverageThreshold: {
-    global: {
-      branches: 80,
-      functions: 80,
-      lines: 80,
-      statements: 80
-    }
-  },
-  moduleNameMapper: {
-    '^vscode$': '<rootDir>/src/test/helpers/vscode-mock.ts'
-  }
-};
-"""
+        _log_say(f'Would create: {config_path}')
+        return None
+    return config_path, json.dumps(config, indent=2).encode('utf-8')
+
+
+def create_jest_config(project_path: Path, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return jest.config.js configuration to be written."""
     config_path = project_path / 'jest.config.js'
     if dry_run:
-        print(f'Would create: {config_path}')
-    else:
-        config_path.write_text(config_content)
-        print(f'Created: {config_path}')
+        _log_say(f'Would create: {config_path}')
+        return None
+    return config_path, read_template('jest.config.js.tmpl')
 
 
-def create_coverage_config(project_path: Path, tool: str, dry_run: bool) -> None:
-    """Create coverage tool configuration."""
+def create_coverage_config(project_path: Path, tool: str, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return coverage tool configuration to be written."""
     if tool == 'c8':
         # c8 config goes in package.json, handled separately
         pass
@@ -220,350 +255,69 @@ def create_coverage_config(project_path: Path, tool: str, dry_run: bool) -> None
         }
         config_path = project_path / '.nycrc.json'
         if dry_run:
-            print(f'Would create: {config_path}')
-        else:
-            config_path.write_text(json.dumps(config, indent=2))
-            print(f'Created: {config_path}')
-
-
-def create_test_setup_file(project_path: Path, framework: str, dry_run: bool) -> None:
-    """Create test setup file."""
-    if framework == 'mocha':
-        content = """import * as chai from 'chai';
-import sinonChai from 'sinon-chai';
-import chaiAsPromised from 'chai-as-promised';
+            _log_say(f'Would create: {config_path}')
+            return None
+        return config_path, json.dumps(config, indent=2).encode('utf-8')
+    return None
 
-// Configure chai plugins
-chai.use(sinonChai);
-chai.use(chaiAsPromised);
-
-export { expect } from 'chai';
-export { default as sinon } from 'sinon';
-"""
-    else:  # jest
-        content = """// Jest setup file
-// Add any global test configuration here
-
-// Extend Jest matchers if needed
-// expect.extend({...});
-"""
 
+def create_test_setup_file(project_path: Path, framework: str, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return test setup file to be written."""
     setup_path = project_path / 'src/test/unit/setup.ts'
     if dry_run:
-        print(f'Would create: {setup_path}')
-    else:
-        setup_path.write_text(content)
-        print(f'Created: {setup_path}')
-
-
-def create_vscode_mock(project_path: Path, dry_run: bool) -> None:
-    """Create VS Code API mock file."""
-    content = """/**
- * VS Code API Mock for unit tests
- * This module provides mock implementations of VS Code APIs
- * for testing code that depends on the VS Code extension API.
- */
-
-import * as sinon from 'sinon';
+        _log_say(f'Would create: {setup_path}')
+        return None
+    return setup_path, read_template(f'setup.{framework}.ts.tmpl')
 
-// Event Emitter Mock
-export class EventEmitter<T> {
-  private listeners: ((e: T) => any)[] = [];
 
-  event = (listener: (e: T) => any) => {
-    this.listeners.push(listener);
-    return { dispose: () => this.listeners = this.listeners.filter(l => l !== listener) };
-  };
-
-  fire(data: T) {
-    this.listeners.forEach(l => l(data));
-  }
-
-  dispose() {
-    this.listeners = [];
-  }
-}
-
-// Uri Mock
-export const Uri = {
-  file: (path: string) => ({ fsPath: path, scheme: 'file', path }),
-  parse: (value: string) => ({ fsPath: value, scheme: 'file', path: value }),
-  joinPath: (base: any, ...pathSegments: string[]) => {
-    const path = [base.path, ...pathSegments].join('/');
-    return { fsPath: path, scheme: base.scheme, path };
-  }
-};
-
-// Window Mock
-export const window = {
-  showInformationMessage: sinon.stub().resolves(undefined),
-  showWarningMessage: sinon.stub().resolves(undefined),
-  showErrorMessage: sinon.stub().resolves(undefined),
-  showQuickPick: sinon.stub().resolves(undefined),
-  showInputBox: sinon.stub().resolves(undefined),
-  createTerminal: sinon.stub(),
-  createWebviewPanel: sinon.stub(),
-  createOutputChannel: sinon.stub().returns({
-    appendLine: sinon.stub(),
-    append: sinon.stub(),
-    clear: sinon.stub(),
-    show: sinon.stub(),
-    hide: sinon.stub(),
-    dispose: sinon.stub()
-  }),
-  createStatusBarItem: sinon.stub().returns({
-    text: '',
-    tooltip: '',
-    command: undefined,
-    show: sinon.stub(),
-    hide: sinon.stub(),
-    dispose: sinon.stub()
-  }),
-  activeTextEditor: undefined,
-  visibleTextEditors: [],
-  onDidChangeActiveTextEditor: new EventEmitter<any>().event,
-  onDidChangeVisibleTextEditors: new EventEmitter<any[]>().event,
-  onDidCloseTerminal: new EventEmitter<any>().event
-};
-
-// Workspace Mock
-export const workspace = {
-  getConfiguration: sinon.stub().returns({
-    get: sinon.stub().returns(undefined),
-    has: sinon.stub().returns(false),
-    inspect: sinon.stub().returns(undefined),
-    update: sinon.stub().resolves()
-  }),
-  workspaceFolders: [],
-  rootPath: '/mock/workspace',
-  name: 'Mock Workspace',
-  openTextDocument: sinon.stub().resolves({}),
-  findFiles: sinon.stub().resolves([]),
-  createFileSystemWatcher: sinon.stub().returns({
-    onDidChange: new EventEmitter<any>().event,
-    onDidCreate: new EventEmitter<any>().event,
-    onDidDelete: new EventEmitter<any>().event,
-    dispose: sinon.stub()
-  }),
-  onDidChangeConfiguration: new EventEmitter<any>().event
-};
-
-// Commands Mock
-export const commands = {
-  registerCommand: sinon.stub().returns({ dispose: sinon.stub() }),
-  executeCommand: sinon.stub().resolves(undefined),
-  getCommands: sinon.stub().resolves([])
-};
-
-// Extensions Mock
-export const extensions = {
-  getExtension: sinon.stub().returns(undefined),
-  all: []
-};
-
-// Enums
-export enum ExtensionMode {
-  Production = 1,
-  Development = 2,
-  Test = 3
-}
+def create_vscode_mock(project_path: Path, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return VS Code API mock file to be written."""
+    mock_path = project_path / 'src/test/helpers/vscode-mock.ts'
+    if dry_run:
+        _log_say(f'Would create: {mock_path}')
+        return None
+    return mock_path, read_template('vscode-mock.ts.tmpl')
 
-export enum ConfigurationTarget {
-  Global = 1,
-  Workspace = 2,
-  WorkspaceFolder = 3
-}
 
-export enum ViewColumn {
-  Active = -1,
-  Beside = -2,
-  One = 1,
-  Two = 2,
-  Three = 3
-}
+def create_github_workflow(project_path: Path, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return GitHub Actions workflow to be written."""
+    workflow_path = project_path / '.github/workflows/test.yml'
+    if dry_run:
+        _log_say(f'Would create: {workflow_path}')
+        return None
+    return workflow_path, read_template('github-workflow.yml.tmpl')
 
-export enum FileType {
-  Unknown = 0,
-  File = 1,
-  Directory = 2,
-  SymbolicLink = 64
-}
 
-// Reset all mocks
-export function resetMocks() {
-  sinon.reset();
-}
-"""
-    mock_path = project_path / 'src/test/helpers/vscode-mock.ts'
-    if dry_run:
-        print(f'Would create: {mock_path}')
-    else:
-        mock_path.write_text(content)
-        print(f'Created: {mock_path}')
-
-
-def create_github_workflow(project_path: Path, dry_run: bool) -> None:
-    """Create GitHub Actions workflow."""
-    workflow_content = """name: Test
-
-on:
-  push:
-    branches: [main, develop]
-  pull_request:
-    branches: [main]
-
-jobs:
-  test:
-    strategy:
-      matrix:
-        os: [ubuntu-latest, windows-latest, macos-latest]
-        vscode-version: ['stable']
-      fail-fast: false
-
-    runs-on: ${{ matrix.os }}
-
-    steps:
-      - uses: actions/checkout@v4
-
-      - name: Setup Node.js
-        uses: actions/setup-node@v4
-        with:
-          node-version: '20'
-          cache: 'npm'
-
-      - name: Install dependencies
-        run: npm ci
-
-      - name: Compile
-        run: npm run compile
-
-      - name: Run unit tests
-        run: npm run test:unit
-
-      - name: Run integration tests (Linux)
-        if: runner.os == 'Linux'
-        run: xvfb-run -a npm run test:integration
-        env:
-          VSCODE_TEST_VERSION: ${{ matrix.vscode-version }}
-
-      - name: Run integration tests (Windows/macOS)
-        if: runner.os != 'Linux'
-        run: npm run test:integration
-        env:
-          VSCODE_TEST_VERSION: ${{ matrix.vscode-version }}
-
-      - name: Upload coverage
-        if: matrix.os == 'ubuntu-latest'
-        uses: codecov/codecov-action@v4
-        with:
-          file: ./coverage/lcov.info
-          fail_ci_if_error: false
-"""
-    workflow_dir = project_path / '.github/workflows'
+def create_sample_test(project_path: Path, framework: str, dry_run: bool) -> Optional[GeneratedFile]:
+    """Return sample test file to be written."""
+    test_path = project_path / 'src/test/unit/sample.test.ts'
     if dry_run:
-        print(f'Would create directory: {workflow_dir}')
-        print(f'Would create: {workflow_dir}/test.yml')
-    else:
-        workflow_dir.mkdir(parents=True, exist_ok=True)
-        (workflow_dir / 'test.yml').write_text(workflow_content)
-        print(f'Created: {workflow_dir}/test.yml')
+        _log_say(f'Would create: {test_path}')
+        return None
+    return test_path, read_template(f'sample.{framework}.test.ts.tmpl')
 
 
-def create_sample_test(project_path: Path, framework: str, dry_run: bool) -> None:
-    """Create sample test file."""
-    if framework == 'mocha':
-        content = """import { expect, sinon } from './setup';
-
-describe('Sample Test Suite', () => {
-  let sandbox: sinon.SinonSandbox;
-
-  beforeEach(() => {
-    sandbox = sinon.createSandbox();
-  });
-
-  afterEach(() => {
-    sandbox.restore();
-  });
-
-  describe('Basic Tests', () => {
-    it('should pass a simple assertion', () => {
-      expect(true).to.be.true;
-    });
-
-    it('should handle async operations', async () => {
-      const result = await Promise.resolve('success');
-      expect(result).to.equal('success');
-    });
-
-    it('should work with stubs', () => {
-      const stub = sandbox.stub().returns('stubbed');
-      expect(stub()).to.equal('stubbed');
-      expect(stub).to.have.been.calledOnce;
-    });
-  });
-
-  describe('TDD Example', () => {
-    it('RED: should implement feature X', () => {
-      // Write the test first (this will fail initially)
-      // const feature = new FeatureX();
-      // expect(feature.doSomething()).to.equal('expected result');
-
-      // TODO: Implement FeatureX to make this test pass
-      expect(true).to.be.true; // Placeholder
-    });
-  });
-});
-"""
-    else:  # jest
-        content = """describe('Sample Test Suite', () => {
-  describe('Basic Tests', () => {
-    it('should pass a simple assertion', () => {
-      expect(true).toBe(true);
-    });
-
-    it('should handle async operations', async () => {
-      const result = await Promise.resolve('success');
-      expect(result).toBe('success');
-    });
-
-    it('should work with mocks', () => {
-      const mock = jest.fn().mockReturnValue('mocked');
-      expect(mock()).toBe('mocked');
-      expect(mock).toHaveBeenCalledTimes(1);
-    });
-  });
-
-  describe('TDD Example', () => {
-    it('RED: should implement feature X', () => {
-      // Write the test first (this will fail initially)
-      // const feature = new FeatureX();
-      // expect(feature.doSomething()).toBe('expected result');
-
-      // TODO: Implement FeatureX to make this test pass
-      expect(true).toBe(true); // Placeholder
-    });
-  });
-});
-"""
+def write_files(files: List[GeneratedFile]) -> None:
+    """Write generated files concurrently."""
+    # Parent directories already exist; each write is independent
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Drain the results so that any write error is raised here
+        list(executor.map(lambda item: item[0].write_bytes(item[1]), files))
 
-    test_path = project_path / 'src/test/unit/sample.test.ts'
-    if dry_run:
-        print(f'Would create: {test_path}')
-    else:
-        test_path.write_text(content)
-        print(f'Created: {test_path}')
+    for path, _ in files:
+        _log_say(f'Created: {path}')
 
 
-def update_package_json(project_path: Path, framework: str, coverage: str, dry_run: bool) -> None:
-    """Update package.json with test scripts."""
+def update_package_json(project_path: Path, framework: str, coverage: str, dry_run: bool) -> Dict[str, Any]:
+    """Update package.json with test scripts and return its devDependencies."""
     package_json_path = project_path / 'package.json'
 
     if not package_json_path.exists():
-        print(f'Warning: package.json not found at {package_json_path}')
-        return
+        _log_say(f'Warning: package.json not found at {package_json_path}')
+        return {}
 
-    with open(package_json_path, 'r') as f:
-        package_json = json.load(f)
+    package_json = load_json(package_json_path)
+    original = copy.deepcopy(package_json)
 
     # Add test scripts
     if 'scripts' not in package_json:
@@ -606,17 +360,27 @@ def update_package_json(project_path: Path, framework: str, coverage: str, dry_r
     scripts['tdd:refactor'] = 'npm run lint && npm run test:unit'
     scripts['tdd:quality-gate'] = 'npm run test:coverage && npm run lint'
 
-    if dry_run:
-        print(f'Would update: {package_json_path}')
-        print(f'Scripts to add: {json.dumps(scripts, indent=2)}')
+    if package_json == original:
+        # Already up to date; skip the rewrite
+        _log_say(f'Unchanged: {package_json_path}')
+    elif dry_run:
+        _log_say(f'Would update: {package_json_path}')
+        _log_say(f'Scripts to add: {json.dumps(scripts, indent=2)}')
     else:
-        with open(package_json_path, 'w') as f:
-            json.dump(package_json, f, indent=2)
-        print(f'Updated: {package_json_path}')
+        package_json_path.write_bytes(dump_json(package_json))
+        _log_say(f'Updated: {package_json_path}')
 
+    return package_json.get('devDependencies', {})
 
-def install_dependencies(project_path: Path, framework: str, coverage: str, dry_run: bool) -> None:
-    """Install npm dependencies."""
+
+def install_dependencies(
+    project_path: Path,
+    framework: str,
+    coverage: str,
+    dev_dependencies: Dict[str, Any],
+    dry_run: bool
+) -> None:
+    """Install npm dependencies not already declared in package.json."""
     deps = []
 
     if framework == 'mocha':
@@ -626,12 +390,19 @@ def install_dependencies(project_path: Path, framework: str, coverage: str, dry_
 
     deps.extend(get_coverage_dependencies(coverage))
 
+    # Declared packages keep their ranges and are resolved by the same pass
+    deps = [dep for dep in deps if dep not in dev_dependencies]
+    save_args = ['--save-dev'] + deps if deps else []
+
     if dry_run:
-        print(f'Would install: {" ".join(deps)}')
+        print(f'Would install: {" ".join(deps) or "(from package.json)"}')
     else:
-        print(f'Installing dependencies: {" ".join(deps)}')
+        print(f'Installing dependencies: {" ".join(deps) or "(from package.json)"}')
         subprocess.run(
-            ['npm', 'install', '--save-dev'] + deps,
+            [
+                'npm', 'install',
+                '--prefer-offline', '--no-audit', '--no-fund', '--loglevel=error'
+            ] + save_args,
             cwd=project_path,
             check=True
         )
@@ -652,33 +423,42 @@ def main():
     print(f'CI: {args.ci}')
     print()
 
-    # Create directory structure
-    create_directory_structure(project_path, args.dry_run)
+    try:
+        # Create directory structure
+        create_directory_structure(project_path, args.ci, args.dry_run)
 
-    # Create configuration files
-    if args.framework == 'mocha':
-        create_vscode_test_config(project_path, args.dry_run)
-        create_mocharc(project_path, args.dry_run)
-    else:
-        create_jest_config(project_path, args.dry_run)
+        # Create configuration files
+        files: List[Optional[GeneratedFile]] = []
+        if args.framework == 'mocha':
+            files.append(create_vscode_test_config(project_path, args.dry_run))
+            files.append(create_mocharc(project_path, args.dry_run))
+        else:
+            files.append(create_jest_config(project_path, args.dry_run))
 
-    create_coverage_config(project_path, args.coverage, args.dry_run)
+        files.append(create_coverage_config(project_path, args.coverage, args.dry_run))
 
-    # Create test files
-    create_test_setup_file(project_path, args.framework, args.dry_run)
-    create_vscode_mock(project_path, args.dry_run)
-    create_sample_test(project_path, args.framework, args.dry_run)
+        # Create test files
+        files.append(create_test_setup_file(project_path, args.framework, args.dry_run))
+        files.append(create_vscode_mock(project_path, args.dry_run))
+        files.append(create_sample_test(project_path, args.framework, args.dry_run))
 
-    # Create CI configuration
-    if args.ci == 'github':
-        create_github_workflow(project_path, args.dry_run)
+        # Create CI configuration
+        if args.ci == 'github':
+            files.append(create_github_workflow(project_path, args.dry_run))
 
-    # Update package.json
-    update_package_json(project_path, args.framework, args.coverage, args.dry_run)
+        if not args.dry_run:
+            write_files([f for f in files if f is not None])
+
+        # Update package.json
+        dev_dependencies = update_package_json(project_path, args.framework, args.coverage, args.dry_run)
+    finally:
+        _flush_log()
 
     # Install dependencies
     if not args.dry_run:
-        install_dependencies(project_path, args.framework, args.coverage, args.dry_run)
+        install_dependencies(
+            project_path, args.framework, args.coverage, dev_dependencies, args.dry_run
+        )
 
     print()
     print('Test environment setup complete!')